@@ -1,8 +1,15 @@
 # app.py
+import calendar
+import os
+from functools import lru_cache
+
 import pandas as pd
 import numpy as np
+import polars as pl
+import pyarrow as pa
+import pyarrow.csv
 from dash import Dash, dcc, html, Input, Output
-import plotly.express as px
+from flask_caching import Cache
 import plotly.graph_objects as go
 import dash_bootstrap_components as dbc
 
@@ -10,51 +17,142 @@ class SuperstoreDashboard:
     def __init__(self, data_path):
         """Initialize dashboard with Superstore data"""
         try:
-            # Load data
-            self.df = pd.read_csv(data_path)
-            print("Columns in dataset:", self.df.columns.tolist())
-            self.preprocess_data()
+            # Load data; a preprocessed Parquet sidecar skips all CSV and
+            # date parsing on restarts as long as the CSV hasn't changed
+            parquet_path = os.path.splitext(data_path)[0] + '.preprocessed.parquet'
+            if (os.path.exists(parquet_path)
+                    and os.path.getmtime(parquet_path) >= os.path.getmtime(data_path)):
+                self.df = pd.read_parquet(parquet_path)
+                print("Columns in dataset:", self.df.columns.tolist())
+            else:
+                self.df = self.load_data(data_path)
+                print("Columns in dataset:", self.df.columns.tolist())
+                self.preprocess_data()
+                self.df.to_parquet(parquet_path, index=False)
+            # Polars view of the frame for multithreaded row-level aggregation
+            self.ldf = pl.from_pandas(self.df).lazy()
+            self.cache_filter_options()
             self.calculate_metrics()
             self.init_app()
         except Exception as e:
             print(f"Error initializing dashboard: {str(e)}")
             raise
 
+    def load_data(self, data_path):
+        """Load the CSV with PyArrow so the DD/MM/YYYY dates are parsed in C"""
+        try:
+            convert_options = pa.csv.ConvertOptions(
+                column_types={'Order Date': pa.timestamp('ns'),
+                              'Ship Date': pa.timestamp('ns')},
+                timestamp_parsers=['%d/%m/%Y']
+            )
+            table = pa.csv.read_csv(data_path, convert_options=convert_options)
+            return table.to_pandas()
+        except pa.ArrowInvalid:
+            # A file the strict Arrow reader rejects (unexpected date
+            # format, odd dialect) still goes through Arrow's threaded C++
+            # tokenizer via pandas; dates stay strings and preprocess_data's
+            # unique-value parser converts them
+            return pd.read_csv(data_path, engine='pyarrow')
+
     def preprocess_data(self):
         """Prepare Superstore data"""
         try:
-            # Convert dates using DD/MM/YYYY format
-            self.df['Order Date'] = pd.to_datetime(self.df['Order Date'], format='%d/%m/%Y')
-            self.df['Ship Date'] = pd.to_datetime(self.df['Ship Date'], format='%d/%m/%Y')
-            
-            # Create time-based features
-            self.df['Year'] = self.df['Order Date'].dt.year
-            self.df['Month'] = self.df['Order Date'].dt.month_name()
-            self.df['Quarter'] = self.df['Order Date'].dt.quarter
-            self.df['WeekDay'] = self.df['Order Date'].dt.day_name()
-            
-            # Calculate shipping duration
-            self.df['Shipping Days'] = (self.df['Ship Date'] - self.df['Order Date']).dt.days
-            
+            # Dates normally arrive parsed from the Arrow reader; if a column
+            # is still strings, parse each unique date once and map it back
+            # instead of running strptime on every row
+            for col in ('Order Date', 'Ship Date'):
+                if not pd.api.types.is_datetime64_any_dtype(self.df[col]):
+                    uniq = pd.Index(self.df[col].unique())
+                    try:
+                        parsed = pd.to_datetime(uniq, format='%d/%m/%Y')
+                    except ValueError:
+                        # Files rescued by the fallback reader may not use
+                        # DD/MM/YYYY at all; let pandas infer, day-first
+                        parsed = pd.to_datetime(uniq, dayfirst=True)
+                    self.df[col] = self.df[col].map(dict(zip(uniq, parsed)))
+
+            # Create time-based features; month/weekday names become ordered
+            # categoricals so groupbys hash 1-byte codes instead of strings
+            # and charts come out in calendar order
+            self.df['Year'] = self.df['Order Date'].dt.year.astype('int16')
+            self.df['Month'] = pd.Categorical.from_codes(
+                self.df['Order Date'].dt.month - 1,
+                categories=list(calendar.month_name)[1:],
+                ordered=True
+            )
+            self.df['Quarter'] = self.df['Order Date'].dt.quarter.astype('int8')
+            self.df['WeekDay'] = pd.Categorical.from_codes(
+                self.df['Order Date'].dt.dayofweek,
+                categories=list(calendar.day_name),
+                ordered=True
+            )
+
+            # Calculate shipping duration straight off the int64 nanosecond
+            # arrays — no Timedelta intermediary from the .dt accessor.
+            # to_numpy('datetime64[ns]') pins the unit first, because
+            # fallback-parsed dates can arrive at a coarser resolution
+            # where a nanosecond divisor would floor every row to zero
+            self.df['Shipping Days'] = (
+                (self.df['Ship Date'].to_numpy('datetime64[ns]').view('i8')
+                 - self.df['Order Date'].to_numpy('datetime64[ns]').view('i8'))
+                // 86_400_000_000_000
+            ).astype('int16')
+
+            # Sales is only ever summed/averaged for display to 2 decimals;
+            # float32 halves the bandwidth of every aggregation sweep
+            self.df['Sales'] = self.df['Sales'].astype('float32')
+
+            # Dictionary-encode the string columns every chart groups or
+            # filters on: isin/groupby then work on small integer codes
+            # instead of hashing object strings
+            for col in ('Category', 'Region', 'Segment', 'Sub-Category',
+                        'Product Name', 'Customer ID', 'Order ID',
+                        'Ship Mode', 'Country', 'State', 'City'):
+                if col in self.df.columns:
+                    self.df[col] = self.df[col].astype('category')
+
             print("Data preprocessing completed successfully!")
             
         except Exception as e:
             print(f"Error in preprocessing: {str(e)}")
             raise
 
+    def cache_filter_options(self):
+        """Precompute the dropdown option lists so building the layout
+        never rescans the full columns"""
+        self._categories = self.df['Category'].unique().tolist()
+        self._regions = self.df['Region'].unique().tolist()
+        self._years = np.sort(self.df['Year'].unique()).tolist()
+
     def calculate_metrics(self):
         """Calculate key business metrics"""
         self.metrics = {
-            'total_sales': self.df['Sales'].sum(),
-            'total_orders': len(self.df['Order ID'].unique()),
-            'avg_order_value': self.df['Sales'].mean(),
-            'unique_customers': len(self.df['Customer ID'].unique())
+            # Accumulate the KPIs in float64 so display formatting doesn't
+            # pick up float32 rounding on large datasets
+            'total_sales': self.df['Sales'].to_numpy().sum(dtype='float64'),
+            'total_orders': self.df['Order ID'].nunique(),
+            'avg_order_value': self.df['Sales'].to_numpy().mean(dtype='float64'),
+            'unique_customers': self.df['Customer ID'].nunique()
         }
 
+        # Precompute the Sales aggregate over every filter dimension once;
+        # callbacks slice this tiny cube instead of re-aggregating raw rows
+        self._agg_cube = self.df.groupby(
+            ['Year', 'Category', 'Region', 'Segment', 'Month'],
+            observed=True)['Sales'].sum().reset_index()
+
     def init_app(self):
         """Initialize Dash app"""
         self.app = Dash(__name__, external_stylesheets=[dbc.themes.COSMO])
-        
+
+        # Server-side cache so repeated filter combinations skip both the
+        # aggregation work and the figure construction
+        self.cache = Cache(self.app.server, config={
+            'CACHE_TYPE': 'SimpleCache',
+            'CACHE_DEFAULT_TIMEOUT': 600
+        })
+
         self.app.layout = dbc.Container([
             # Header
             dbc.Row([
@@ -100,7 +198,7 @@ class SuperstoreDashboard:
                     dcc.Dropdown(
                         id='category-filter',
                         options=[{'label': x, 'value': x} 
-                                for x in self.df['Category'].unique()],
+                                for x in self._categories],
                         value=None,
                         multi=True
                     )
@@ -111,7 +209,7 @@ class SuperstoreDashboard:
                     dcc.Dropdown(
                         id='region-filter',
                         options=[{'label': x, 'value': x} 
-                                for x in self.df['Region'].unique()],
+                                for x in self._regions],
                         value=None,
                         multi=True
                     )
@@ -122,8 +220,8 @@ class SuperstoreDashboard:
                     dcc.Dropdown(
                         id='year-filter',
                         options=[{'label': str(x), 'value': x} 
-                                for x in sorted(self.df['Year'].unique())],
-                        value=self.df['Year'].max()
+                                for x in self._years],
+                        value=self._years[-1]
                     )
                 ], width=4)
             ], className="mb-4"),
@@ -196,6 +294,210 @@ class SuperstoreDashboard:
         self.setup_callbacks()
 
     def setup_callbacks(self):
+        @lru_cache(maxsize=64)
+        def _tables(cat_key, reg_key, year):
+            """Run the chart aggregations for one filter combination,
+            sharing groupby passes between charts"""
+            # Row-level aggregations run in Polars: one fused filter, then
+            # all four group-bys collected in a single multithreaded pass
+            predicates = []
+            if cat_key:
+                predicates.append(pl.col('Category').is_in(list(cat_key)))
+            if reg_key:
+                predicates.append(pl.col('Region').is_in(list(reg_key)))
+            if year:
+                predicates.append(pl.col('Year') == year)
+            filtered = self.ldf.filter(predicates) if predicates else self.ldf
+
+            # One Customer ID x Region pass feeds both customer charts;
+            # pl.len() is a per-group row count, with no null-skipping scan
+            per_customer_region = filtered.group_by(['Customer ID', 'Region']).agg(
+                pl.col('Sales').sum(), pl.len().alias('Order ID'))
+
+            customers, region_customers, subcats, products, weekday_month = [
+                result.to_pandas() for result in pl.collect_all([
+                    per_customer_region.group_by('Customer ID').agg(
+                        pl.col('Sales').sum(), pl.col('Order ID').sum()),
+                    per_customer_region.group_by('Region').agg(
+                        pl.col('Customer ID').n_unique()),
+                    filtered.group_by(['Category', 'Sub-Category']).agg(pl.col('Sales').sum()),
+                    filtered.group_by('Product Name').agg(pl.col('Sales').sum()),
+                    filtered.group_by(['WeekDay', 'Month']).agg(pl.col('Sales').sum()),
+                ])
+            ]
+
+            # All pure-Sales charts come from the precomputed cube: one
+            # fused query() pass (numexpr-backed) selects the matching
+            # groups, then the dimensions each chart doesn't need are
+            # folded out
+            parts = []
+            if cat_key:
+                parts.append('Category in @cat_key')
+            if reg_key:
+                parts.append('Region in @reg_key')
+            if year:
+                parts.append('Year == @year')
+            cube = self._agg_cube.query(' and '.join(parts)) if parts else self._agg_cube
+
+            cat_month = cube.groupby(['Category', 'Month'], observed=True)['Sales'].sum()
+
+            # Partial top-K: argpartition picks the 10 best products in
+            # O(U), then only those 10 are sorted for display
+            sales = products['Sales'].to_numpy()
+            k = min(10, len(sales))
+            top_idx = np.argpartition(sales, -k)[-k:] if k else np.array([], dtype=int)
+            top_idx = top_idx[np.argsort(sales[top_idx])]
+
+            return {
+                'monthly_trend': cat_month.groupby(level='Month', observed=True).sum().reset_index(),
+                'category_sales': cat_month.groupby(level='Category', observed=True).sum().reset_index(),
+                'category_trend': cat_month.reset_index(),
+                'region_sales': cube.groupby('Region', observed=True)['Sales'].sum().reset_index(),
+                'customer_region': region_customers,
+                'segment_sales': cube.groupby('Segment', observed=True)['Sales'].sum().reset_index(),
+                'customer_segments': customers,
+                'subcategory_sales': subcats,
+                'top_products': products.iloc[top_idx],
+                'order_patterns': weekday_month.pivot_table(
+                    index='Month', columns='WeekDay', values='Sales',
+                    aggfunc='sum', observed=True).fillna(0).reindex(
+                        index=[m for m in month_order if m in set(weekday_month['Month'])],
+                        columns=[d for d in weekday_order if d in set(weekday_month['WeekDay'])]),
+            }
+
+        # Calendar ordering pinned on every month/weekday axis so Plotly
+        # never falls back to alphabetical sorting
+        month_order = list(calendar.month_name)[1:]
+        weekday_order = list(calendar.day_name)
+
+        # One layout dict per chart, built once and reused by every callback
+        figure_layouts = {
+            'monthly_trend': {'title': 'Monthly Sales Trend',
+                              'xaxis': {'title': 'Month', 'categoryorder': 'array',
+                                        'categoryarray': month_order},
+                              'yaxis': {'title': 'Sales'}},
+            'category_sales': {'title': 'Sales by Category'},
+            'region_sales': {'title': 'Sales by Region',
+                             'xaxis': {'title': 'Region'}, 'yaxis': {'title': 'Sales'}},
+            'segment_sales': {'title': 'Sales by Segment',
+                              'xaxis': {'title': 'Segment'}, 'yaxis': {'title': 'Sales'}},
+            'customer_segments': {'title': 'Customer Segmentation',
+                                  'xaxis': {'title': 'Sales'}, 'yaxis': {'title': 'Order ID'}},
+            'customer_region': {'title': 'Customers by Region'},
+            'order_patterns': {'title': 'Order Patterns',
+                               'xaxis': {'title': 'WeekDay', 'categoryorder': 'array',
+                                         'categoryarray': weekday_order},
+                               'yaxis': {'title': 'Month', 'categoryorder': 'array',
+                                         'categoryarray': month_order}},
+            'subcategory_sales': {'title': 'Sales by Sub-Category'},
+            'top_products': {'title': 'Top 10 Products',
+                             'xaxis': {'title': 'Sales'}, 'yaxis': {'title': 'Product Name'}},
+            'category_trend': {'title': 'Category Sales Trends',
+                               'xaxis': {'title': 'Month', 'categoryorder': 'array',
+                                         'categoryarray': month_order},
+                               'yaxis': {'title': 'Sales'}},
+        }
+
+        # Per-chart trace templates: static trace attributes are validated
+        # through graph_objects once at startup, and every render assembles
+        # fresh plain dicts around them. Dash serves callbacks from multiple
+        # threads, so nothing shared between requests is ever mutated
+        trace_templates = {
+            'monthly_trend': go.Scatter(mode='lines').to_plotly_json(),
+            'category_sales': go.Pie().to_plotly_json(),
+            'region_sales': go.Bar().to_plotly_json(),
+            'segment_sales': go.Bar().to_plotly_json(),
+            'customer_segments': go.Scatter(mode='markers').to_plotly_json(),
+            'customer_region': go.Pie().to_plotly_json(),
+            'order_patterns': go.Heatmap(colorbar={'title': 'Sales'}).to_plotly_json(),
+            'subcategory_sales': go.Treemap(branchvalues='total').to_plotly_json(),
+            'top_products': go.Bar(orientation='h').to_plotly_json(),
+            'category_trend': go.Scatter(mode='lines').to_plotly_json(),
+        }
+
+        def _figure(name, **arrays):
+            # Fresh dicts per call; the shared template and layout are
+            # only read, never written
+            return {'data': [{**trace_templates[name], **arrays}],
+                    'layout': figure_layouts[name]}
+
+        @self.cache.memoize()
+        def _render(cat_key, reg_key, year):
+            tables = _tables(cat_key, reg_key, year)
+
+            # Drop the pre-aggregated arrays into per-call figure dicts,
+            # which is also the form Dash serializes without revalidation
+            monthly = tables['monthly_trend']
+            monthly_trend = _figure('monthly_trend',
+                                    x=monthly['Month'].to_numpy(),
+                                    y=monthly['Sales'].to_numpy())
+
+            by_category = tables['category_sales']
+            category_sales = _figure('category_sales',
+                                     labels=by_category['Category'].to_numpy(),
+                                     values=by_category['Sales'].to_numpy())
+
+            by_region = tables['region_sales']
+            region_sales = _figure('region_sales',
+                                   x=by_region['Region'].to_numpy(),
+                                   y=by_region['Sales'].to_numpy())
+
+            by_segment = tables['segment_sales']
+            segment_sales = _figure('segment_sales',
+                                    x=by_segment['Segment'].to_numpy(),
+                                    y=by_segment['Sales'].to_numpy())
+
+            by_customer = tables['customer_segments']
+            customer_segments = _figure('customer_segments',
+                                        x=by_customer['Sales'].to_numpy(),
+                                        y=by_customer['Order ID'].to_numpy())
+
+            per_region = tables['customer_region']
+            customer_region = _figure('customer_region',
+                                      labels=per_region['Region'].to_numpy(),
+                                      values=per_region['Customer ID'].to_numpy())
+
+            heat = tables['order_patterns']
+            order_patterns = _figure('order_patterns',
+                                     x=heat.columns.tolist(),
+                                     y=heat.index.tolist(),
+                                     z=heat.to_numpy())
+
+            subcats = tables['subcategory_sales']
+            cat_totals = subcats.groupby('Category', observed=True)['Sales'].sum()
+            subcategory_sales = _figure(
+                'subcategory_sales',
+                ids=(['All'] + ['All/' + c for c in cat_totals.index]
+                     + ['All/' + c + '/' + s for c, s
+                        in zip(subcats['Category'], subcats['Sub-Category'])]),
+                labels=(['All'] + cat_totals.index.tolist()
+                        + subcats['Sub-Category'].tolist()),
+                parents=([''] + ['All'] * len(cat_totals)
+                         + ['All/' + c for c in subcats['Category']]),
+                values=([cat_totals.sum()] + cat_totals.tolist()
+                        + subcats['Sales'].tolist())
+            )
+
+            top = tables['top_products']
+            top_products = _figure('top_products',
+                                   x=top['Sales'].to_numpy(),
+                                   y=top['Product Name'].to_numpy())
+
+            # One trace per category present in the filtered data
+            trend = tables['category_trend']
+            category_trend = {
+                'data': [{**trace_templates['category_trend'],
+                          'x': group['Month'].to_numpy(),
+                          'y': group['Sales'].to_numpy(),
+                          'name': str(category)}
+                         for category, group in trend.groupby('Category', observed=True)],
+                'layout': figure_layouts['category_trend'],
+            }
+
+            return [monthly_trend, category_sales, region_sales, segment_sales,
+                   customer_segments, customer_region, order_patterns,
+                   subcategory_sales, top_products, category_trend]
+
         @self.app.callback(
             [Output('monthly-sales-trend', 'figure'),
              Output('sales-by-category', 'figure'),
@@ -212,96 +514,11 @@ class SuperstoreDashboard:
              Input('year-filter', 'value')]
         )
         def update_graphs(categories, regions, year):
-            # Filter data based on selections
-            dff = self.df.copy()
-            if categories:
-                dff = dff[dff['Category'].isin(categories)]
-            if regions:
-                dff = dff[dff['Region'].isin(regions)]
-            if year:
-                dff = dff[dff['Year'] == year]
-            
-            # Create figures
-            monthly_trend = px.line(
-                dff.groupby('Month')['Sales'].sum().reset_index(),
-                x='Month',
-                y='Sales',
-                title='Monthly Sales Trend'
-            )
-            
-            category_sales = px.pie(
-                dff.groupby('Category')['Sales'].sum().reset_index(),
-                values='Sales',
-                names='Category',
-                title='Sales by Category'
-            )
-            
-            region_sales = px.bar(
-                dff.groupby('Region')['Sales'].sum().reset_index(),
-                x='Region',
-                y='Sales',
-                title='Sales by Region'
-            )
-            
-            segment_sales = px.bar(
-                dff.groupby('Segment')['Sales'].sum().reset_index(),
-                x='Segment',
-                y='Sales',
-                title='Sales by Segment'
-            )
-            
-            customer_segments = px.scatter(
-                dff.groupby('Customer ID').agg({
-                    'Sales': 'sum',
-                    'Order ID': 'count'
-                }).reset_index(),
-                x='Sales',
-                y='Order ID',
-                title='Customer Segmentation'
-            )
-            
-            customer_region = px.pie(
-                dff.groupby('Region')['Customer ID'].nunique().reset_index(),
-                values='Customer ID',
-                names='Region',
-                title='Customers by Region'
-            )
-            
-            order_patterns = px.density_heatmap(
-                dff,
-                x='WeekDay',
-                y='Month',
-                z='Sales',
-                title='Order Patterns'
-            )
-            
-            subcategory_sales = px.treemap(
-                dff.groupby(['Category', 'Sub-Category'])['Sales'].sum().reset_index(),
-                path=[px.Constant('All'), 'Category', 'Sub-Category'],
-                values='Sales',
-                title='Sales by Sub-Category'
-            )
-            
-            top_products = px.bar(
-                dff.groupby('Product Name')['Sales'].sum()
-                   .nlargest(10).sort_values(ascending=True).reset_index(),
-                x='Sales',
-                y='Product Name',
-                orientation='h',
-                title='Top 10 Products'
-            )
-            
-            category_trend = px.line(
-                dff.groupby(['Month', 'Category'])['Sales'].sum().reset_index(),
-                x='Month',
-                y='Sales',
-                color='Category',
-                title='Category Sales Trends'
-            )
-            
-            return [monthly_trend, category_sales, region_sales, segment_sales,
-                   customer_segments, customer_region, order_patterns,
-                   subcategory_sales, top_products, category_trend]
+            # Sorted tuples give one stable cache key per selection,
+            # whatever order the dropdown values arrive in
+            cat_key = tuple(sorted(categories)) if categories else ()
+            reg_key = tuple(sorted(regions)) if regions else ()
+            return _render(cat_key, reg_key, year)
 
     def run_server(self, debug=True, port=8050):
         """Run the dashboard server"""